@@ -1,10 +1,17 @@
 import os
-from typing import Optional, List
+import atexit
+import heapq
+import logging
+from functools import partial
+from typing import Optional, List, Dict
 import typer
 from rich.console import Console
+from rich.live import Live
+from rich.logging import RichHandler
 from rich.table import Table
 from rich import box
 from .metrics import GitHubMetrics
+from .models import ContributionMetrics
 
 app = typer.Typer(help="GitHub Contribution Metrics - Analyze PR contributions in organizations")
 console = Console()
@@ -14,80 +21,165 @@ GitHub Contribution Metrics
 
 Usage:
     # Compare specific users
-    python -m src.cli analyze -u dev1 -u dev2 -o organization [-d days] [-t token]
+    python -m src.cli analyze -u dev1 -u dev2 -o organization [-d days] [-n top] [-t token]
 
     # List org members
     python -m src.cli members -o organization [-t token]
 
     # Analyze all members
-    python -m src.cli analyze-all -o organization [-d days] [--min-prs count] [-t token]
+    python -m src.cli analyze-all -o organization [-d days] [-n top] [--min-prs count] [-t token]
 
 Options:
     -u, --username    GitHub username (can be multiple)
     -o, --org        GitHub organization name
     -d, --days       Number of days to analyze [default: 7]
+    -n, --top        Only show the top N users by total changes
     -t, --token      GitHub API token (or set GITHUB_TOKEN env var)
     --min-prs        Minimum number of PRs to include user [default: 1]
 """
 
+@app.callback()
+def setup_logging():
+    """GitHub Contribution Metrics - Analyze PR contributions in organizations"""
+    # Log through the shared console so messages print above Live tables
+    # instead of tearing them; GitHubMetrics' basicConfig then becomes a no-op
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S',
+        handlers=[RichHandler(console=console)]
+    )
+
+def _new_contribution_table(title: str) -> Table:
+    """Create an empty contribution metrics table."""
+    table = Table(
+        title=title,
+        box=box.ROUNDED,
+        show_header=True,
+        header_style="bold cyan",
+        show_lines=True
+    )
+    
+    # Add columns
+    table.add_column("Username", style="bold")
+    table.add_column("Total PRs", justify="right")
+    table.add_column("Median Changes", justify="right")
+    table.add_column("Additions", justify="right", style="green")
+    table.add_column("Deletions", justify="right", style="red")
+    table.add_column("Reviews Given", justify="right", style="blue")
+    table.add_column("Total Changes", justify="right", style="bold")
+    table.add_column("Impact Score", justify="right", style="yellow")
+    
+    return table
+
+def _add_contribution_row(table: Table, username: str, metrics: ContributionMetrics):
+    """Add one user's metrics to a contribution metrics table."""
+    table.add_row(
+        username,
+        str(metrics.total_prs),
+        f"{metrics.median_changes:,.0f}",
+        f"{metrics.total_additions:,}",
+        f"{metrics.total_deletions:,}",
+        str(metrics.reviews_given),
+        f"{metrics.total_changes:,}",
+        f"{metrics.multiplied_changes:,.0f}"
+    )
+
+def _contribution_table(title: str, results: Dict[str, ContributionMetrics], top: Optional[int] = None) -> Table:
+    """Build the contribution metrics table, sorted by total changes.
+
+    With top, only the top users by total changes are included.
+    """
+    table = _new_contribution_table(title)
+    
+    # Sort users by total changes
+    if top is not None:
+        sorted_users = heapq.nlargest(top, results.items(), key=lambda x: x[1].total_changes)
+    else:
+        sorted_users = sorted(results.items(), key=lambda x: x[1].total_changes, reverse=True)
+    
+    # Add rows for each user
+    for username, metrics in sorted_users:
+        _add_contribution_row(table, username, metrics)
+    
+    return table
+
 @app.command()
 def analyze(
     usernames: List[str] = typer.Option(..., "--username", "-u", help="GitHub usernames (can be multiple)"),
     org: str = typer.Option(..., "--org", "-o", help="GitHub organization name"),
     days: int = typer.Option(7, "--days", "-d", help="Number of days to analyze"),
+    top: Optional[int] = typer.Option(None, "--top", "-n", min=1, help="Only show the top N users by total changes"),
     token: Optional[str] = typer.Option(None, "--token", "-t", help="GitHub API token", envvar="GITHUB_TOKEN"),
 ):
     """Analyze contributions for multiple users in an organization"""
     try:
         metrics = GitHubMetrics(token)
-        all_results = metrics.get_users_org_contributions(usernames, org, days)
+        atexit.register(metrics.client.close)
+        title = f"Contribution Metrics in {org} (Last {days} days)"
+        
+        # Show users as their batches arrive, then print the sorted table
+        live_table = _new_contribution_table(title)
+        with Live(live_table, console=console, refresh_per_second=4, transient=True):
+            all_results = metrics.get_users_org_contributions(
+                usernames, org, days,
+                on_user_ready=partial(_add_contribution_row, live_table)
+            )
         
         if not all_results:
             console.print(f"[bold red]No data found for any users in {org}[/]")
             raise typer.Exit(1)
         
-        # Create table
-        table = Table(
-            title=f"Contribution Metrics in {org} (Last {days} days)",
-            box=box.ROUNDED,
-            show_header=True,
-            header_style="bold cyan",
-            show_lines=True
-        )
+        table = _contribution_table(title, all_results, top)
         
-        # Add columns
-        table.add_column("Username", style="bold")
-        table.add_column("Total PRs", justify="right")
-        table.add_column("Median Changes", justify="right")
-        table.add_column("Additions", justify="right", style="green")
-        table.add_column("Deletions", justify="right", style="red")
-        table.add_column("Reviews Given", justify="right", style="blue")
-        table.add_column("Total Changes", justify="right", style="bold")
-        table.add_column("Impact Score", justify="right", style="yellow")
-        
-        # Sort users by total changes
-        sorted_users = sorted(
-            all_results.items(),
-            key=lambda x: x[1].total_additions + x[1].total_deletions,
-            reverse=True
-        )
+        # Print the table
+        console.print()
+        console.print(table)
+        console.print()
         
-        # Add rows for each user
-        for username, metrics in sorted_users:
-            table.add_row(
-                username,
-                str(metrics.total_prs),
-                f"{metrics.median_changes:,.0f}",
-                f"{metrics.total_additions:,}",
-                f"{metrics.total_deletions:,}",
-                str(metrics.reviews_given),
-                f"{metrics.total_additions + metrics.total_deletions:,}",
-                f"{metrics.multiplied_changes:,.0f}"
-            )
+    except Exception as e:
+        console.print("[bold red]Error:[/] " + str(e), style="red")
+        raise typer.Exit(1)
+
+
+@app.command()
+def analyze_all(
+    org: str = typer.Option(..., "--org", "-o", help="GitHub organization name"),
+    days: int = typer.Option(7, "--days", "-d", help="Number of days to analyze"),
+    top: Optional[int] = typer.Option(None, "--top", "-n", min=1, help="Only show the top N users by total changes"),
+    min_prs: int = typer.Option(1, "--min-prs", help="Minimum number of PRs to include user"),
+    token: Optional[str] = typer.Option(None, "--token", "-t", help="GitHub API token", envvar="GITHUB_TOKEN"),
+):
+    """Analyze contributions for all members of an organization"""
+    try:
+        metrics = GitHubMetrics(token)
+        atexit.register(metrics.client.close)
+        title = f"Contribution Metrics in {org} (Last {days} days)"
+        
+        def on_user_ready(username: str, user_metrics: ContributionMetrics):
+            if user_metrics.total_prs >= min_prs:
+                _add_contribution_row(live_table, username, user_metrics)
+        
+        # Show members as their pages arrive, then print the sorted table
+        live_table = _new_contribution_table(title)
+        with Live(live_table, console=console, refresh_per_second=4, transient=True):
+            all_results = metrics.get_org_contributions(org, days, on_user_ready=on_user_ready)
+        
+        results = {
+            username: user_metrics for username, user_metrics in all_results.items()
+            if user_metrics.total_prs >= min_prs
+        }
+        
+        if not results:
+            console.print(f"[bold red]No members of {org} with at least {min_prs} PRs[/]")
+            raise typer.Exit(1)
+        
+        table = _contribution_table(title, results, top)
         
         # Print the table
         console.print()
         console.print(table)
+        console.print(f"\nMembers shown: {table.row_count} of {len(all_results)}")
         console.print()
         
     except Exception as e:
@@ -103,6 +195,7 @@ def list_users(
     """List all users in an organization"""
     try:
         metrics = GitHubMetrics(token)
+        atexit.register(metrics.client.close)
         
         # Get all org members
         members = metrics.client.get_org_members(org)
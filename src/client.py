@@ -1,23 +1,111 @@
 import os
+import hashlib
 import logging
-from typing import List, Optional, Dict
+from typing import Callable, Iterator, List, Optional, Dict
 import requests
-from datetime import datetime, timedelta
-from .models import PullRequest
+from requests.adapters import HTTPAdapter
+from datetime import date, datetime, timedelta, timezone
+from .models import UserPRArrays
 import typer
 from functools import lru_cache, wraps
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from array import array
 import time
 import random
 
+try:
+    import orjson as json_lib
+except ImportError:  # orjson is optional; the stdlib parser is just slower
+    import json as json_lib
+
+# Upper bound on GraphQL requests in flight at once, across all threads
+MAX_CONCURRENT_REQUESTS = 10
+# Users per GraphQL document. Point cost is never the limit here (50 searches
+# cost 1 point); the limit is GitHub's per-query timeout, and 25 users is the
+# size this tool has always run at without hitting it. Smaller documents also
+# give the concurrent batches and live rows something to work with.
+BATCH_SIZE = 25
+# Per-user on-disk cache for PR results, never the working directory, so a
+# checkout cannot plant cache entries
+CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'github-metrics'
+)
+# How long cached PR results stay fresh
+CACHE_TTL_SECONDS = 600
+# Bump when the shape of cached results changes so stale entries are ignored
+CACHE_VERSION = 3
+# Keep-alive connections held open per session
+CONNECTION_POOL_SIZE = 20
+# Start pacing requests once the remaining rate-limit budget drops below this
+RATE_LIMIT_THRESHOLD = 500
+# Budget held back so other tools sharing the token are not starved
+RATE_LIMIT_BUFFER = 100
+
+# Per-user part of the batched PR query, filled in with str.format
+_USER_FRAGMENT = """
+            user_{j}: search(
+                query: "org:{org} author:{username} created:>={since_date} type:pr",
+                type: ISSUE,
+                first: 100
+            ) {{
+                nodes {{
+                    ... on PullRequest {{
+                        number
+                        additions
+                        deletions
+                    }}
+                }}
+            }}
+            reviews_{j}: search(
+                query: "org:{org} reviewed-by:{username} updated:>={since_date} type:pr",
+                type: ISSUE,
+                first: 100
+            ) {{
+                nodes {{
+                    ... on PullRequest {{
+                        number
+                        author {{
+                            login
+                        }}
+                    }}
+                }}
+            }}
+"""
+
+_BATCH_QUERY = """
+        query {{
+            {user_queries}
+            rateLimit {{
+                limit
+                cost
+                remaining
+                resetAt
+            }}
+        }}
+"""
+
+@lru_cache(maxsize=128)
+def _build_batch_query(batch: tuple, org: str, since_date: str) -> str:
+    """Build one GraphQL document that searches PRs and reviews for every user in the batch."""
+    user_queries = "".join([
+        _USER_FRAGMENT.format(j=j, username=username, org=org, since_date=since_date)
+        for j, username in enumerate(batch)
+    ])
+    return _BATCH_QUERY.format(user_queries=user_queries)
+
 def timer(func):
-    """Decorator to time API calls."""
+    """Decorator to time API calls; a plain call when INFO logging is off."""
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start = time.time()
-        result = func(*args, **kwargs)
-        duration = time.time() - start
         # Get the instance (self) from args
         instance = args[0]
+        if not instance.logger.isEnabledFor(logging.INFO):
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        duration = time.perf_counter() - start
         instance.logger.info(f"{func.__name__} took {duration:.2f} seconds")
         return result
     return wrapper
@@ -52,89 +140,118 @@ class GitHubClient:
         if not self.token:
             raise ValueError("GitHub token is required. Set GITHUB_TOKEN environment variable or pass token to constructor.")
         
-        self.headers = {
-            'Authorization': f'token {self.token}',
-            'Accept': 'application/vnd.github.v3+json'
-        }
         self.graphql_headers = {
             'Authorization': f'bearer {self.token}',
             'Content-Type': 'application/json',
+            # requests adds this by default; set it explicitly so proxies keep compression
+            'Accept-Encoding': 'gzip, deflate',
         }
         self.base_url = 'https://api.github.com'
         self.logger = logging.getLogger(__name__)
+        # Reuse connections across requests instead of a new TLS handshake each time
+        self.graphql_session = self._create_session(self.graphql_headers)
+        self._rate_state = {"remaining": 5000, "reset": 0}
+        self._rate_lock = threading.Lock()
+        self._next_send_time = 0.0
+        self._request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+        self.cache_dir = CACHE_DIR
+
+    def _create_session(self, headers: Dict) -> requests.Session:
+        """Create a keep-alive session with a connection pool sized for our workers."""
+        session = requests.Session()
+        session.headers.update(headers)
+        adapter = HTTPAdapter(
+            pool_connections=CONNECTION_POOL_SIZE,
+            pool_maxsize=CONNECTION_POOL_SIZE,
+            max_retries=0
+        )
+        session.mount('https://', adapter)
+        return session
+
+    def close(self):
+        """Close the underlying HTTP session."""
+        self.graphql_session.close()
 
     @timer
-    @lru_cache(maxsize=32)
-    def get_users_contributed_repos_and_prs(self, usernames: tuple, org: str, since_days: int = 7) -> Dict[str, List[PullRequest]]:
-        """Get all PRs by multiple users in an organization using GraphQL."""
+    def get_users_contributed_repos_and_prs(
+        self,
+        usernames: tuple,
+        org: str,
+        since_days: int = 7,
+        on_batch: Optional[Callable[[Dict[str, UserPRArrays]], None]] = None
+    ) -> Dict[str, UserPRArrays]:
+        """Get all PRs by multiple users in an organization using GraphQL.
+
+        Results are cached on disk for a few minutes, keyed by the org, the
+        set of usernames, the window and today's date, so repeated runs do
+        not hit the API again. Any iterable of usernames is accepted; logins
+        are case-insensitive, so they are lowercased and deduplicated and the
+        returned dict is keyed by the lowercased login.
+
+        If given, on_batch is called from the calling thread with each
+        batch's results as soon as that batch completes.
+        """
+        usernames = tuple(sorted({u.lower() for u in usernames}))
+        cache_key = hashlib.sha1(repr(
+            (CACHE_VERSION, org, usernames, since_days, date.today().isoformat())
+        ).encode()).hexdigest()
+        cached = self._read_cache(cache_key)
+        if cached is not None:
+            try:
+                cached = {username: UserPRArrays.from_dict(prs) for username, prs in cached.items()}
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                self.logger.warning(f"Ignoring malformed cache entry: {str(e)}")
+                cached = None
+        if cached is not None:
+            self.logger.info(f"Using cached results for {len(usernames)} users")
+            if on_batch:
+                on_batch(cached)
+            return cached
+
         since_date = (datetime.now() - timedelta(days=since_days)).strftime('%Y-%m-%d')
         results = {}
         
-        # Process users in batches of 25 to avoid query complexity limits
-        BATCH_SIZE = 25
-        for i in range(0, len(usernames), BATCH_SIZE):
-            batch = usernames[i:i + BATCH_SIZE]
-            self.logger.info(f"Processing batch of {len(batch)} users ({i+1}-{i+len(batch)} of {len(usernames)})")
-            
-            batch_results = self._process_user_batch(batch, org, since_date)
-            results.update(batch_results)
-            
-            # Small delay between batches to avoid rate limiting
-            time.sleep(1)
+        # Process users in batches to stay clear of GraphQL query timeouts
+        batches = [usernames[i:i + BATCH_SIZE] for i in range(0, len(usernames), BATCH_SIZE)]
+        self.logger.info(f"Processing {len(usernames)} users in {len(batches)} batches")
+        
+        # Batches are independent, so fetch them concurrently; the pool size
+        # bounds how many requests hit the API at the same time.
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            futures = [
+                executor.submit(self._process_user_batch, batch, org, since_date)
+                for batch in batches
+            ]
+            for future in as_completed(futures):
+                batch_results = future.result()
+                results.update(batch_results)
+                if on_batch:
+                    on_batch(batch_results)
         
+        self._write_cache(cache_key, {username: prs.to_dict() for username, prs in results.items()})
         return results
 
     @retry_with_backoff(retries=3, backoff_in_seconds=1)
-    def _process_user_batch(self, batch: List[str], org: str, since_date: str) -> Dict[str, List[PullRequest]]:
+    def _process_user_batch(self, batch: tuple, org: str, since_date: str) -> Dict[str, UserPRArrays]:
         """Process a batch of users with retry logic."""
-        user_queries = " ".join([
-            f"""
-            user_{j}: search(
-                query: "org:{org} author:{username} created:>={since_date} type:pr",
-                type: ISSUE,
-                first: 100
-            ) {{
-                nodes {{
-                    ... on PullRequest {{
-                        number
-                        additions
-                        deletions
-                        createdAt
-                        mergedAt
-                        state
-                    }}
-                }}
-            }}
-            reviews_{j}: search(
-                query: "org:{org} reviewed-by:{username} updated:>={since_date} type:pr",
-                type: ISSUE,
-                first: 100
-            ) {{
-                nodes {{
-                    ... on PullRequest {{
-                        number
-                        author {{
-                            login
-                        }}
-                    }}
-                }}
-            }}
-            """ for j, username in enumerate(batch)
-        ])
-        
-        query = f"""
-        query {{
-            {user_queries}
-        }}
-        """
-        
+        query = _build_batch_query(batch, org, since_date)
         response = self._post_graphql(query, {})
         
         if not response or 'data' not in response:
             self.logger.error(f"Invalid response from GitHub API: {response}")
             raise ValueError("Invalid response from GitHub API")
 
-        results = {username: [] for username in batch}
+        # GraphQL is billed in points, so prefer the point budget over headers
+        rate_limit = response['data'].get('rateLimit')
+        if rate_limit:
+            self.logger.debug(f"Batch of {len(batch)} users cost {rate_limit.get('cost')} points")
+            reset = datetime.fromisoformat(rate_limit['resetAt'][:-1])
+            self._update_rate_state(
+                rate_limit['remaining'],
+                reset.replace(tzinfo=timezone.utc).timestamp()
+            )
+
+        results = {username: UserPRArrays.empty() for username in batch}
         
         for j, username in enumerate(batch):
             user_data = response['data'].get(f'user_{j}')
@@ -151,26 +268,14 @@ class GitHubClient:
                     if node and node.get('author')
                 ])
 
-            prs = []
-            for node in user_data.get('nodes', []):
-                if not node:
-                    continue
-
-                try:
-                    prs.append(PullRequest(
-                        number=node.get('number'),
-                        additions=node.get('additions', 0),
-                        deletions=node.get('deletions', 0),
-                        created_at=node.get('createdAt'),
-                        merged_at=node.get('mergedAt'),
-                        state=node.get('state', 'unknown'),
-                        reviews_given=reviews_given  # Add this to PR object
-                    ))
-                except Exception as e:
-                    self.logger.warning(f"Error processing PR for {username}: {str(e)}")
-                    continue
-
-            results[username] = prs
+            # Store PR fields as columns rather than one object per PR
+            nodes = [node for node in user_data.get('nodes', []) if node]
+            results[username] = UserPRArrays(
+                numbers=array('q', (node.get('number') for node in nodes)),
+                additions=array('q', (node.get('additions', 0) for node in nodes)),
+                deletions=array('q', (node.get('deletions', 0) for node in nodes)),
+                reviews_given=reviews_given
+            )
             
         return results
 
@@ -178,6 +283,14 @@ class GitHubClient:
     @lru_cache(maxsize=32)
     def get_org_members(self, org: str) -> List[Dict]:
         """Get all members of an organization using GraphQL."""
+        return [member for page in self.iter_org_member_pages(org) for member in page]
+
+    def iter_org_member_pages(self, org: str) -> Iterator[List[Dict]]:
+        """Yield organization members one page at a time as they are fetched.
+
+        Lets callers start working on the first members while later pages
+        are still being requested.
+        """
         query = """
         query($org: String!, $cursor: String) {
           organization(login: $org) {
@@ -196,7 +309,6 @@ class GitHubClient:
         }
         """
         
-        members = []
         cursor = None
         
         while True:
@@ -214,130 +326,130 @@ class GitHubClient:
             org_data = response['data']['organization']
             members_data = org_data['membersWithRole']
             
-            members.extend([{
+            yield [{
                 'login': member['login'],
                 'url': member['url'],
                 'type': member['type']
-            } for member in members_data['nodes']])
+            } for member in members_data['nodes']]
             
             if not members_data['pageInfo']['hasNextPage']:
                 break
                 
             cursor = members_data['pageInfo']['endCursor']
-        
-        return members
 
     @retry_with_backoff(retries=3, backoff_in_seconds=1)
     def _post_graphql(self, query: str, variables: Dict) -> Dict:
         """Make a POST request to the GitHub GraphQL API with retries."""
-        url = 'https://api.github.com/graphql'
-        response = requests.post(
-            url,
-            headers=self.graphql_headers,
-            json={'query': query, 'variables': variables}
-        )
+        self._maybe_throttle()
+        url = f'{self.base_url}/graphql'
+        body = json_lib.dumps({'query': query, 'variables': variables})
+        # Shared by every thread pool using this client, so nested pools
+        # cannot push more than MAX_CONCURRENT_REQUESTS requests in flight
+        with self._request_slots:
+            # Content-Type: application/json is already set on the session
+            response = self.graphql_session.post(url, data=body)
         response.raise_for_status()
-        return response.json()
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is not None and reset is not None:
+            self._update_rate_state(int(remaining), int(reset))
+        return json_lib.loads(response.content)
+
+    def _update_rate_state(self, remaining: int, reset: float):
+        """Record the latest rate-limit budget reported by the API."""
+        with self._rate_lock:
+            # A new window starts a fresh send schedule
+            if reset != self._rate_state["reset"]:
+                self._next_send_time = 0.0
+            self._rate_state["remaining"] = remaining
+            self._rate_state["reset"] = reset
+
+    def _maybe_throttle(self):
+        """Sleep only when the remaining rate-limit budget is running low.
+
+        Requests are sent from several threads, so each caller reserves its
+        own send slot; the slots together spread the remaining budget evenly
+        until the reset instead of every thread waiting the same interval.
+        """
+        with self._rate_lock:
+            remaining = self._rate_state["remaining"]
+            reset = self._rate_state["reset"]
+            if remaining >= RATE_LIMIT_THRESHOLD:
+                return
+
+            now = time.time()
+            if remaining <= RATE_LIMIT_BUFFER:
+                # Nothing left to spend before the window resets
+                send_at = reset
+            else:
+                # Slots never run past the reset, when the budget refills
+                interval = max(0, (reset - now) / (remaining - RATE_LIMIT_BUFFER))
+                send_at = min(max(now, self._next_send_time), reset)
+                self._next_send_time = min(send_at + interval, reset)
+
+        sleep_for = send_at - now
+        if sleep_for > 0:
+            self.logger.warning(
+                f"Rate limit low ({remaining} remaining). "
+                f"Waiting {sleep_for:.2f} seconds..."
+            )
+            time.sleep(sleep_for)
 
     def clear_cache(self):
         """Clear the cached results."""
-        self.get_org_members.cache_clear()
-        self.get_users_contributed_repos_and_prs.cache_clear()
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.cache_dir, name))
+        # timer wraps the lru_cache wrapper, which is where cache_clear lives
+        self.get_org_members.__wrapped__.cache_clear()
 
-    def get_user_contributed_repos(self, username: str, org: str, since_days: int = 7) -> List[str]:
-        """Get repositories where the user has created PRs within the specified time period."""
-        repos = set()
-        page = 1
-        since_date = (datetime.now() - timedelta(days=since_days)).strftime('%Y-%m-%d')
-        
-        while True:
-            query = f'org:{org} author:{username} created:>={since_date}'
-            response = self._get('/search/issues', params={
-                'q': query,
-                'type': 'pr',
-                'page': page,
-                'per_page': 100,
-                'sort': 'created',
-                'order': 'desc'
-            })
-            
-            items = response.get('items', [])
-            if not items:
-                break
-                
-            for item in items:
-                repo = '/'.join(item['repository_url'].split('/')[-2:])
-                repos.add(repo)
-            
-            if len(items) < 100 or self._is_rate_limited(response):
-                break
-                
-            page += 1
-        
-        return list(repos)
+    def _read_cache(self, key: str):
+        """Return the cached JSON value for key, or None if missing or expired."""
+        path = os.path.join(self.cache_dir, f'{key}.json')
+        try:
+            if time.time() - os.path.getmtime(path) >= CACHE_TTL_SECONDS:
+                os.remove(path)
+                return None
+            with open(path, 'rb') as f:
+                return json_lib.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable cache entry {path}: {str(e)}")
+            return None
 
-    def get_pull_requests(self, username: str, repo: str, since_days: int = 7) -> List[PullRequest]:
-        """Get all PRs by a user in a repository within the specified time period."""
-        prs = []
-        page = 1
-        since_date = (datetime.now() - timedelta(days=since_days)).strftime('%Y-%m-%d')
-        cutoff_date = datetime.now() - timedelta(days=since_days)
-        
-        while True:
-            try:
-                response = self._get(f'/repos/{repo}/pulls', params={
-                    'state': 'all',
-                    'creator': username,
-                    'page': page,
-                    'per_page': 100,
-                    'since': since_date
-                })
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 404:
-                    self.logger.warning(f"Repository not found or no access: {repo}")
-                    return []
-                raise
-                
-            if not response:
-                break
-                
-            recent_prs = [
-                pr for pr in response 
-                if datetime.strptime(pr['created_at'], '%Y-%m-%dT%H:%M:%SZ') > cutoff_date
-            ]
-            
-            if not recent_prs:
-                break
-                
-            for pr in recent_prs:
-                pr_details = self._get(f'/repos/{repo}/pulls/{pr["number"]}')
-                if pr_details:
-                    prs.append(PullRequest(
-                        number=pr_details['number'],
-                        additions=pr_details['additions'],
-                        deletions=pr_details['deletions'],
-                        created_at=pr_details['created_at']
-                    ))
-            
-            if len(recent_prs) < 100:
-                break
-                
-            page += 1
-        
-        return prs
+    def _write_cache(self, key: str, value):
+        """Store a JSON-serializable value under key, replacing any previous entry atomically."""
+        path = os.path.join(self.cache_dir, f'{key}.json')
+        try:
+            # Cached results include private org data, so keep them owner-only
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            data = json_lib.dumps(value)
+            if isinstance(data, str):  # stdlib json returns str, orjson bytes
+                data = data.encode()
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Could not write cache entry {path}: {str(e)}")
+        self._prune_cache()
 
-    def _get(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
-        """Make a GET request to the GitHub API."""
-        url = f'{self.base_url}{endpoint}'
-        response = requests.get(url, headers=self.headers, params=params)
-        response.raise_for_status()
-        return response.json()
-
-    def _is_rate_limited(self, response: requests.Response) -> bool:
-        """Check if we're approaching the rate limit."""
-        if 'X-RateLimit-Remaining' in response.headers:
-            remaining = int(response.headers['X-RateLimit-Remaining'])
-            if remaining < 10:
-                self.logger.warning("Approaching GitHub API rate limit")
-                return True
-        return False 
\ No newline at end of file
+    def _prune_cache(self):
+        """Delete expired entries; keys include the date, so most are never read again."""
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        cutoff = time.time() - CACHE_TTL_SECONDS
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                # Another process may have removed or replaced it already
+                continue
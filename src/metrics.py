@@ -1,10 +1,16 @@
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from operator import add
 from statistics import median
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
 from .client import GitHubClient
-from .models import ContributionMetrics, PullRequest
+from .models import ContributionMetrics, UserPRArrays
 from datetime import datetime
 
+# Member pages whose PRs may be fetched at the same time in get_org_contributions
+MAX_CONCURRENT_PAGES = 4
+
 class GitHubMetrics:
     def __init__(self, token: str = None):
         """Initialize metrics calculator."""
@@ -16,40 +22,92 @@ class GitHubMetrics:
         self.logger = logging.getLogger(__name__)
         self.client = GitHubClient(token)
 
-    def get_users_org_contributions(self, usernames: List[str], org: str, days: int = 7) -> Dict[str, ContributionMetrics]:
-        """Get contribution metrics for multiple users in an organization."""
+    def get_users_org_contributions(
+        self,
+        usernames: List[str],
+        org: str,
+        days: int = 7,
+        on_user_ready: Optional[Callable[[str, ContributionMetrics], None]] = None
+    ) -> Dict[str, ContributionMetrics]:
+        """Get contribution metrics for multiple users in an organization.
+
+        If given, on_user_ready is called with each user's metrics as soon as
+        the batch containing that user has been fetched.
+        """
         self.logger.info(f"Fetching contributions for {len(usernames)} users in {org}")
         
-        # Convert usernames list to tuple for caching
-        usernames_tuple = tuple(usernames)
+        # The client normalizes logins to lowercase; keep the first spelling
+        # the caller used so the output shows their names
+        display_names = {}
+        for username in usernames:
+            display_names.setdefault(username.lower(), username)
         
-        # Get all PRs for all users in one request
-        all_prs = self.client.get_users_contributed_repos_and_prs(usernames_tuple, org, days)
-        
-        # Calculate metrics for each user
+        # Calculate metrics for each user as their batch comes in
         results = {}
-        for username, prs in all_prs.items():
-            self.logger.info(f"Processing metrics for {username} ({len(prs)} PRs)")
-            results[username] = self._calculate_metrics(prs)
+        
+        def process_batch(batch_prs: Dict[str, UserPRArrays]):
+            for username, prs in batch_prs.items():
+                username = display_names.get(username, username)
+                self.logger.debug(f"Processing metrics for {username} ({len(prs)} PRs)")
+                results[username] = self._calculate_metrics(prs)
+                if on_user_ready:
+                    on_user_ready(username, results[username])
+        
+        self.client.get_users_contributed_repos_and_prs(
+            tuple(display_names), org, days, on_batch=process_batch
+        )
         
         return results
 
-    def _calculate_metrics(self, prs: List[PullRequest]) -> ContributionMetrics:
-        """Calculate metrics from a list of pull requests."""
-        if not prs:
-            return ContributionMetrics.empty()
+    def get_org_contributions(
+        self,
+        org: str,
+        days: int = 7,
+        on_user_ready: Optional[Callable[[str, ContributionMetrics], None]] = None
+    ) -> Dict[str, ContributionMetrics]:
+        """Get contribution metrics for every member of an organization.
 
-        changes_per_pr = [pr.additions + pr.deletions for pr in prs]
-        total_additions = sum(pr.additions for pr in prs)
-        total_deletions = sum(pr.deletions for pr in prs)
+        PRs for each page of members are fetched while the next page of
+        members is still being listed, instead of waiting for the full list.
+        on_user_ready behaves as in get_users_org_contributions and is never
+        called concurrently.
+        """
+        self.logger.info(f"Fetching contributions for all members of {org}")
         
-        # Get reviews given (will be same for all PRs since it's per user)
-        reviews_given = prs[0].reviews_given if prs else 0
+        if on_user_ready:
+            # Pages are processed on worker threads; serialize the callback
+            lock = threading.Lock()
+            user_ready = on_user_ready
+            
+            def on_user_ready(username: str, user_metrics: ContributionMetrics):
+                with lock:
+                    user_ready(username, user_metrics)
+        
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PAGES) as executor:
+            futures = [
+                executor.submit(
+                    self.get_users_org_contributions,
+                    [member['login'] for member in page], org, days, on_user_ready
+                )
+                for page in self.client.iter_org_member_pages(org)
+                if page
+            ]
+            results = {}
+            for future in futures:
+                results.update(future.result())
+        
+        return results
 
+    def _calculate_metrics(self, prs: UserPRArrays) -> ContributionMetrics:
+        """Calculate metrics from a user's pull request columns."""
+        if not prs:
+            return ContributionMetrics.empty()
+
+        additions, deletions = prs.additions, prs.deletions
         return ContributionMetrics(
             total_prs=len(prs),
-            median_changes=median(changes_per_pr),
-            total_additions=total_additions,
-            total_deletions=total_deletions,
-            reviews_given=reviews_given
-        ) 
\ No newline at end of file
+            median_changes=median(map(add, additions, deletions)),
+            total_additions=sum(additions),
+            total_deletions=sum(deletions),
+            reviews_given=prs.reviews_given
+        )
@@ -1,18 +1,52 @@
+import sys
+from array import array
 from dataclasses import dataclass
+from functools import cached_property
 from typing import List, Dict
 from datetime import datetime
 
-@dataclass
-class PullRequest:
-    number: int
-    additions: int
-    deletions: int
-    created_at: str
-    merged_at: str = None
-    state: str = "open"
+# Slotted dataclasses drop the per-instance __dict__; slots=True needs Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
+class UserPRArrays:
+    """A user's PRs stored column-wise, one array entry per PR."""
+    numbers: array
+    additions: array
+    deletions: array
     reviews_given: int = 0
 
-@dataclass
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    @classmethod
+    def empty(cls) -> 'UserPRArrays':
+        return cls(
+            numbers=array('q'),
+            additions=array('q'),
+            deletions=array('q'),
+            reviews_given=0
+        )
+
+    def to_dict(self) -> Dict:
+        """Convert to plain JSON-serializable data."""
+        return {
+            'numbers': self.numbers.tolist(),
+            'additions': self.additions.tolist(),
+            'deletions': self.deletions.tolist(),
+            'reviews_given': self.reviews_given
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'UserPRArrays':
+        return cls(
+            numbers=array('q', data['numbers']),
+            additions=array('q', data['additions']),
+            deletions=array('q', data['deletions']),
+            reviews_given=data['reviews_given']
+        )
+
+@dataclass  # No slots: cached_property stores its value in the instance __dict__
 class ContributionMetrics:
     total_prs: int
     median_changes: float
@@ -20,11 +54,16 @@ class ContributionMetrics:
     total_deletions: int
     reviews_given: int = 0
 
-    @property
+    @cached_property
     def multiplied_changes(self) -> float:
         """Calculate impact score (PRs × Median Changes)."""
         return self.median_changes * self.total_prs
 
+    @cached_property
+    def total_changes(self) -> int:
+        """Sum of all lines modified (additions + deletions)."""
+        return self.total_additions + self.total_deletions
+
     @classmethod
     def empty(cls) -> 'ContributionMetrics':
         return cls(
@@ -55,7 +94,7 @@ class ComponentMetrics:
             return NotImplemented
         return self.name < other.name
 
-@dataclass
+@dataclass(**_SLOTS)
 class ReviewMetrics:
     reviewer: str
     total_reviews: int
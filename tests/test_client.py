@@ -0,0 +1,69 @@
+import threading
+import unittest
+from unittest import mock
+
+from src.client import GitHubClient
+
+NOW = 1_000_000.0
+
+
+class MaybeThrottleTest(unittest.TestCase):
+    def setUp(self):
+        self.client = GitHubClient("token")
+        self.sleeps = []
+        self.sleeps_lock = threading.Lock()
+
+        def fake_sleep(seconds):
+            with self.sleeps_lock:
+                self.sleeps.append(seconds)
+
+        patchers = [
+            mock.patch("src.client.time.time", return_value=NOW),
+            mock.patch("src.client.time.sleep", side_effect=fake_sleep),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def throttle_concurrently(self, callers=10):
+        """Run _maybe_throttle from several threads and return the waits, sorted."""
+        threads = [threading.Thread(target=self.client._maybe_throttle) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return sorted([0.0] * (callers - len(self.sleeps)) + self.sleeps)
+
+    def test_no_wait_with_plenty_of_budget(self):
+        self.client._update_rate_state(4000, NOW + 60)
+        self.assertEqual(self.throttle_concurrently(), [0.0] * 10)
+
+    def test_concurrent_callers_get_successive_slots(self):
+        # 50 requests left above the buffer over 100s: one slot every 2s
+        self.client._update_rate_state(150, NOW + 100)
+        self.assertEqual(self.throttle_concurrently(), [2.0 * i for i in range(10)])
+
+    def test_slots_are_clamped_to_reset(self):
+        # 5 requests left above the buffer over 10s: later callers wait for the reset
+        self.client._update_rate_state(105, NOW + 10)
+        self.assertEqual(
+            self.throttle_concurrently(),
+            [0.0, 2.0, 4.0, 6.0, 8.0, 10.0, 10.0, 10.0, 10.0, 10.0]
+        )
+
+    def test_exhausted_budget_waits_for_reset(self):
+        self.client._update_rate_state(50, NOW + 60)
+        self.assertEqual(self.throttle_concurrently(), [60.0] * 10)
+
+    def test_new_window_clears_schedule(self):
+        self.client._update_rate_state(150, NOW + 100)
+        self.throttle_concurrently()
+        self.sleeps.clear()
+
+        self.client._update_rate_state(150, NOW + 200)
+        # 50 slots over 200s: the schedule restarts at now, one slot every 4s
+        self.assertEqual(self.throttle_concurrently(3), [0.0, 4.0, 8.0])
+
+
+if __name__ == "__main__":
+    unittest.main()